@@ -17,14 +17,23 @@ Functions
 
 from __future__ import division, print_function, absolute_import
 
+import math
+from collections import namedtuple
+
 import numpy as np
+import scipy.sparse as sps
 from .optimize import OptimizeResult, _check_unknown_options
 from ._linprog_ip import _linprog_ip
+from ._linprog_pivot import pivot
 
 __all__ = ['linprog', 'linprog_verbose_callback', 'linprog_terse_callback']
 
 __docformat__ = "restructuredtext en"
 
+# Print options used by linprog_verbose_callback while it prints the tableau
+_VERBOSE_PRINTOPTIONS = dict(linewidth=500,
+                             formatter={'float': "{0: 12.4f}".format})
+
 
 def linprog_verbose_callback(xk, **kwargs):
     """
@@ -64,8 +73,17 @@ def linprog_verbose_callback(xk, **kwargs):
     complete = kwargs["complete"]
 
     saved_printoptions = np.get_printoptions()
-    np.set_printoptions(linewidth=500,
-                        formatter={'float': lambda x: "{0: 12.4f}".format(x)})
+    np.set_printoptions(**_VERBOSE_PRINTOPTIONS)
+    try:
+        _print_verbose_iteration(xk, tableau, nit, pivrow, pivcol, phase,
+                                 basis, complete)
+    finally:
+        np.set_printoptions(**saved_printoptions)
+
+
+def _print_verbose_iteration(xk, tableau, nit, pivrow, pivcol, phase, basis,
+                             complete):
+    """Print the report of linprog_verbose_callback for one iteration."""
     if complete:
         print("--------- Iteration Complete - Phase {0:d} -------\n".format(phase))
         print("Tableau:")
@@ -88,7 +106,6 @@ def linprog_verbose_callback(xk, **kwargs):
         print("Current Objective Value:")
         print("f = ", -tableau[-1, -1])
         print()
-    np.set_printoptions(**saved_printoptions)
 
 
 def linprog_terse_callback(xk, **kwargs):
@@ -107,11 +124,6 @@ def linprog_terse_callback(xk, **kwargs):
         tableau : array_like
             The current tableau of the simplex algorithm.
             Its structure is defined in _solve_simplex.
-        vars : tuple(str, ...)
-            Column headers for each column in tableau.
-            "x[i]" for actual variables, "s[i]" for slack surplus variables,
-            "a[i]" for artificial variables, and "RHS" for the constraint
-            RHS vector.
         phase : int
             The current Phase of the simplex algorithm (1 or 2)
         nit : int
@@ -119,10 +131,9 @@ def linprog_terse_callback(xk, **kwargs):
         pivot : tuple(int, int)
             The index of the tableau selected as the next pivot,
             or nan if no pivot exists
-        basics : list[tuple(int, float)]
+        basis : array(int)
             A list of the current basic variables.
-            Each element contains the index of a basic variable and
-            its value.
+            Each element contains the index of a basic variable.
         complete : bool
             True if the simplex algorithm has completed
             (and this is the final call to callback), otherwise False.
@@ -163,15 +174,22 @@ def _pivot_col(T, tol=1.0E-12, bland=False):
         The index of the column of the pivot element.
         If status is False, col will be returned as nan.
     """
-    ma = np.ma.masked_where(T[-1, :-1] >= -tol, T[-1, :-1], copy=False)
-    if ma.count() == 0:
-        return False, np.nan
     if bland:
-        return True, np.where(ma.mask == False)[0][0]
-    return True, np.ma.where(ma == ma.min())[0][0]
+        cols = np.flatnonzero(T[-1, :-1] < -tol)
+        if cols.size == 0:
+            return False, np.nan
+        return True, cols[0]
+    if T.shape[1] == 1:
+        # There are no variables to enter the basis
+        return False, np.nan
+    # The most negative coefficient decides both optimality and the column
+    col = np.argmin(T[-1, :-1])
+    if T[-1, col] >= -tol:
+        return False, np.nan
+    return True, col
 
 
-def _pivot_row(T, pivcol, phase, tol=1.0E-12):
+def _pivot_row(T, basis, pivcol, phase, tol=1.0E-12, bland=False):
     """
     Given a linear programming simplex tableau, determine the row for the
     pivot operation.
@@ -180,6 +198,9 @@ def _pivot_row(T, pivcol, phase, tol=1.0E-12):
     ----------
     T : 2D ndarray
         The simplex tableau.
+    basis : array
+        An array of the indices of the basic variables, such that basis[i]
+        contains the column corresponding to the basic variable for row i.
     pivcol : int
         The index of the pivot column.
     phase : int
@@ -188,6 +209,9 @@ def _pivot_row(T, pivcol, phase, tol=1.0E-12):
         Elements in the pivot column smaller than tol will not be considered
         for pivoting.  Nominally this value is zero, but numerical issues
         cause a tolerance about zero to be necessary.
+    bland : bool
+        If True, use Bland's rule for selection of the row (if more than one
+        row can be used, choose the one with the lowest variable index).
 
     Returns
     -------
@@ -202,16 +226,50 @@ def _pivot_row(T, pivcol, phase, tol=1.0E-12):
         k = 2
     else:
         k = 1
-    ma = np.ma.masked_where(T[:-k, pivcol] <= tol, T[:-k, pivcol], copy=False)
-    if ma.count() == 0:
+    # Only rows with a positive entry in the pivot column take part in the
+    # minimum ratio test; ties go to the first such row.
+    rows = np.flatnonzero(T[:-k, pivcol] > tol)
+    if rows.size == 0:
         return False, np.nan
-    mb = np.ma.masked_where(T[:-k, pivcol] <= tol, T[:-k, -1], copy=False)
-    q = mb / ma
-    return True, np.ma.where(q == q.min())[0][0]
+    q = T[rows, -1] / T[rows, pivcol]
+    if bland:
+        # Among the rows achieving the minimum ratio, the leaving variable is
+        # the one with the smallest index.
+        min_rows = rows[q == q.min()]
+        return True, min_rows[np.argmin(basis[min_rows])]
+    return True, rows[np.argmin(q)]
+
+
+def _apply_pivot(T, basis, pivrow, pivcol):
+    """
+    Pivot the simplex tableau inplace on the element given by (pivrow, pivcol).
+    The entering variable corresponds to the column given by pivcol forcing
+    the variable basis[pivrow] to leave the basis.
+
+    Parameters
+    ----------
+    T : 2D ndarray
+        The simplex tableau.
+    basis : 1D ndarray
+        An array of the indices of the basic variables, such that basis[i]
+        contains the column corresponding to the basic variable for row i.
+        Basis is modified in place.
+    pivrow : int
+        The index of the pivot row.
+    pivcol : int
+        The index of the pivot column.
+    """
+    # variable represented by pivcol enters
+    # variable in basis[pivrow] leaves
+    basis[pivrow] = pivcol
+    pivot(T, pivrow, pivcol)
+
 
+# Solver settings shared by both phases of _solve_simplex
+_SimplexContext = namedtuple('_SimplexContext', 'n callback tol bland')
 
-def _solve_simplex(T, n, basis, maxiter=1000, phase=2, callback=None,
-                   tol=1.0E-12, nit0=0, bland=False):
+
+def _solve_simplex(T, basis, ctx, phase, maxiter, nit0=0):
     """
     Solve a linear programming problem in "standard maximization form" using
     the Simplex Method.
@@ -254,40 +312,45 @@ def _solve_simplex(T, n, basis, maxiter=1000, phase=2, callback=None,
          for a Phase 1 problem (a Problem in which a basic feasible solution is
          sought prior to maximizing the actual objective.  T is modified in
          place by _solve_simplex.
-    n : int
-        The number of true variables in the problem.
     basis : array
         An array of the indices of the basic variables, such that basis[i]
         contains the column corresponding to the basic variable for row i.
         Basis is modified in place by _solve_simplex
-    maxiter : int
-        The maximum number of iterations to perform before aborting the
-        optimization.
+    ctx : _SimplexContext
+        The settings shared by both phases of the problem.  Its fields are:
+
+        n : int
+            The number of true variables in the problem.
+        callback : callable or None
+            If a callback function is provided, it will be called within each
+            iteration of the simplex algorithm. The callback must have the
+            signature `callback(xk, **kwargs)` where xk is the current
+            solution vector and kwargs is a dictionary containing the
+            following::
+            "tableau" : The current Simplex algorithm tableau
+            "nit" : The current iteration.
+            "pivot" : The pivot (row, column) used for the next iteration.
+            "phase" : Whether the algorithm is in Phase 1 or Phase 2.
+            "basis" : The indices of the columns of the basic variables.
+        tol : float
+            The tolerance which determines when a solution is "close enough"
+            to zero in Phase 1 to be considered a basic feasible solution or
+            close enough to positive to serve as an optimal solution.
+        bland : bool
+            If True, choose pivots using Bland's rule [3].  In problems which
+            fail to converge due to cycling, using Bland's rule can provide
+            convergence at the expense of a less optimal path about the
+            simplex.
     phase : int
         The phase of the optimization being executed.  In phase 1 a basic
         feasible solution is sought and the T has an additional row
         representing an alternate objective function.
-    callback : callable, optional
-        If a callback function is provided, it will be called within each
-        iteration of the simplex algorithm. The callback must have the
-        signature `callback(xk, **kwargs)` where xk is the current solution
-        vector and kwargs is a dictionary containing the following::
-        "T" : The current Simplex algorithm T
-        "nit" : The current iteration.
-        "pivot" : The pivot (row, column) used for the next iteration.
-        "phase" : Whether the algorithm is in Phase 1 or Phase 2.
-        "basis" : The indices of the columns of the basic variables.
-    tol : float
-        The tolerance which determines when a solution is "close enough" to
-        zero in Phase 1 to be considered a basic feasible solution or close
-        enough to positive to serve as an optimal solution.
+    maxiter : int
+        The maximum number of iterations to perform before aborting the
+        optimization.
     nit0 : int
         The initial iteration number used to keep an accurate iteration total
         in a two-phase problem.
-    bland : bool
-        If True, choose pivots using Bland's rule [3].  In problems which
-        fail to converge due to cycling, using Bland's rule can provide
-        convergence at the expense of a less optimal path about the simplex.
 
     Returns
     -------
@@ -304,6 +367,7 @@ def _solve_simplex(T, n, basis, maxiter=1000, phase=2, callback=None,
 
         See `OptimizeResult` for a description of other attributes.
     """
+    n, callback, tol, bland = ctx
     nit = nit0
     complete = False
 
@@ -323,27 +387,23 @@ def _solve_simplex(T, n, basis, maxiter=1000, phase=2, callback=None,
         # Ref: "An Introduction to Linear Programming and Game Theory"
         # by Paul R. Thie, Gerard E. Keough, 3rd Ed,
         # Chapter 3.7 Redundant Systems (pag 102)
-        for pivrow in [row for row in range(basis.size)
-                       if basis[row] > T.shape[1] - 2]:
-            non_zero_row = [col for col in range(T.shape[1] - 1)
-                            if T[pivrow, col] != 0]
+        for pivrow in np.flatnonzero(basis > T.shape[1] - 2):
+            non_zero_row = np.flatnonzero(T[pivrow, :-1])
             if len(non_zero_row) > 0:
                 pivcol = non_zero_row[0]
-                # variable represented by pivcol enters
-                # variable in basis[pivrow] leaves
-                basis[pivrow] = pivcol
-                pivval = T[pivrow][pivcol]
-                T[pivrow, :] = T[pivrow, :] / pivval
-                for irow in range(T.shape[0]):
-                    if irow != pivrow:
-                        T[irow, :] = T[irow, :] - T[pivrow, :]*T[irow, pivcol]
+                _apply_pivot(T, basis, pivrow, pivcol)
                 nit += 1
 
-    if len(basis[:m]) == 0:
-        solution = np.zeros(T.shape[1] - 1, dtype=np.float64)
+    # The solution vector is only needed to report progress to the callback,
+    # as are the callback arguments which do not change between iterations.
+    if callback is None:
+        solution = None
+    elif len(basis[:m]) == 0:
+        solution = np.zeros(T.shape[1] - 1, dtype=T.dtype)
     else:
-        solution = np.zeros(max(T.shape[1] - 1, max(basis[:m]) + 1),
-                            dtype=np.float64)
+        solution = np.zeros(max(T.shape[1] - 1, basis[:m].max() + 1),
+                            dtype=T.dtype)
+    callback_kwargs = {"tableau": T, "phase": phase, "basis": basis}
 
     while not complete:
         # Find the pivot column
@@ -355,7 +415,8 @@ def _solve_simplex(T, n, basis, maxiter=1000, phase=2, callback=None,
             complete = True
         else:
             # Find the pivot row
-            pivrow_found, pivrow = _pivot_row(T, pivcol, phase, tol)
+            pivrow_found, pivrow = _pivot_row(T, basis, pivcol, phase, tol,
+                                              bland)
             if not pivrow_found:
                 status = 3
                 complete = True
@@ -363,12 +424,8 @@ def _solve_simplex(T, n, basis, maxiter=1000, phase=2, callback=None,
         if callback is not None:
             solution[:] = 0
             solution[basis[:m]] = T[:m, -1]
-            callback(solution[:n], **{"tableau": T,
-                                      "phase": phase,
-                                      "nit": nit,
-                                      "pivot": (pivrow, pivcol),
-                                      "basis": basis,
-                                      "complete": complete and phase == 2})
+            callback(solution[:n], nit=nit, pivot=(pivrow, pivcol),
+                     complete=(complete and phase == 2), **callback_kwargs)
 
         if not complete:
             if nit >= maxiter:
@@ -376,14 +433,7 @@ def _solve_simplex(T, n, basis, maxiter=1000, phase=2, callback=None,
                 status = 1
                 complete = True
             else:
-                # variable represented by pivcol enters
-                # variable in basis[pivrow] leaves
-                basis[pivrow] = pivcol
-                pivval = T[pivrow][pivcol]
-                T[pivrow, :] = T[pivrow, :] / pivval
-                for irow in range(T.shape[0]):
-                    if irow != pivrow:
-                        T[irow, :] = T[irow, :] - T[pivrow, :]*T[irow, pivcol]
+                _apply_pivot(T, basis, pivrow, pivcol)
                 nit += 1
 
     return nit, status
@@ -391,7 +441,8 @@ def _solve_simplex(T, n, basis, maxiter=1000, phase=2, callback=None,
 
 def _linprog_simplex(c, A_ub=None, b_ub=None, A_eq=None, b_eq=None,
                      bounds=None, maxiter=1000, disp=False, callback=None,
-                     tol=1.0E-12, bland=False, **unknown_options):
+                     tol=1.0E-12, bland=False, dtype=np.float64,
+                     **unknown_options):
     """
     Solve the following linear programming problem via a two-phase
     simplex algorithm.::
@@ -405,13 +456,13 @@ def _linprog_simplex(c, A_ub=None, b_ub=None, A_eq=None, b_eq=None,
     ----------
     c : array_like
         Coefficients of the linear objective function to be minimized.
-    A_ub : array_like
+    A_ub : array_like or sparse matrix
         2-D array which, when matrix-multiplied by ``x``, gives the values of
         the upper-bound inequality constraints at ``x``.
     b_ub : array_like
         1-D array of values representing the upper-bound of each inequality
         constraint (row) in ``A_ub``.
-    A_eq : array_like
+    A_eq : array_like or sparse matrix
         2-D array which, when matrix-multiplied by ``x``, gives the values of
         the equality constraints at ``x``.
     b_eq : array_like
@@ -458,6 +509,15 @@ def _linprog_simplex(c, A_ub=None, b_ub=None, A_eq=None, b_eq=None,
         prevent cycling.  If False, choose pivots which should lead to a
         converged solution more quickly.  The latter method is subject to
         cycling (non-convergence) in rare instances.
+    dtype : dtype
+        The floating point type of the simplex tableau, either ``np.float64``
+        (default) or ``np.float32``.  ``x``, ``slack`` and ``fun`` are
+        returned in this type.  Single precision halves the memory
+        traffic of each pivot at the cost of accuracy and robustness: round
+        off accumulates faster, so degenerate or badly scaled problems are
+        more likely to be reported infeasible or to cycle.  With
+        ``np.float32``, ``tol`` is raised to at least 100 times its machine
+        epsilon, about 1.2e-5.
 
     Returns
     -------
@@ -556,9 +616,17 @@ def _linprog_simplex(c, A_ub=None, b_ub=None, A_eq=None, b_eq=None,
     # The number of variables as given by c
     n = len(c)
 
-    # Convert the input arguments to arrays (sized to zero if not provided)
-    Aeq = np.asarray(A_eq) if A_eq is not None else np.empty([0, len(cc)])
-    Aub = np.asarray(A_ub) if A_ub is not None else np.empty([0, len(cc)])
+    # Convert the input arguments to arrays (sized to zero if not provided).
+    # Sparse constraint matrices are kept sparse; their nonzeros are written
+    # straight into the tableau below.
+    if sps.issparse(A_eq):
+        Aeq = A_eq.tocoo()
+    else:
+        Aeq = np.asarray(A_eq) if A_eq is not None else np.empty([0, n])
+    if sps.issparse(A_ub):
+        Aub = A_ub.tocoo()
+    else:
+        Aub = np.asarray(A_ub) if A_ub is not None else np.empty([0, n])
     beq = np.ravel(np.asarray(b_eq)) if b_eq is not None else np.empty([0])
     bub = np.ravel(np.asarray(b_ub)) if b_ub is not None else np.empty([0])
 
@@ -580,105 +648,70 @@ def _linprog_simplex(c, A_ub=None, b_ub=None, A_eq=None, b_eq=None,
             message = ("Invalid input for linprog with method = 'simplex'.  "
                        "Length of bounds is inconsistent with the length of c")
         else:
-            try:
-                for i in range(n):
-                    if len(bounds[i]) != 2:
-                        raise IndexError()
-                    L[i] = bounds[i][0] if bounds[i][0] is not None else -np.inf
-                    U[i] = bounds[i][1] if bounds[i][1] is not None else np.inf
-            except IndexError:
+            bounds = np.array(bounds, dtype=object)
+            if bounds.shape != (n, 2):
                 status = -1
                 message = ("Invalid input for linprog with "
                            "method = 'simplex'.  bounds must be a n x 2 "
                            "sequence/array where n = len(c).")
+            else:
+                lb = bounds[:, 0]
+                ub = bounds[:, 1]
+                L = np.where(np.equal(lb, None), -np.inf, lb).astype(np.float64)
+                U = np.where(np.equal(ub, None), np.inf, ub).astype(np.float64)
+
+    # The number of columns of A_ub and A_eq
+    n_A = n
 
     if np.any(L == -np.inf):
         # If any lower-bound constraint is a free variable
         # add the first column variable as the "floor" variable which
         # accommodates the most negative variable in the problem.
+        # The columns of A_ub and A_eq then follow the floor variable.
         n = n + 1
         L = np.concatenate([np.array([0]), L])
         U = np.concatenate([np.array([np.inf]), U])
         cc = np.concatenate([np.array([0]), cc])
-        Aeq = np.hstack([np.zeros([Aeq.shape[0], 1]), Aeq])
-        Aub = np.hstack([np.zeros([Aub.shape[0], 1]), Aub])
         have_floor_variable = True
 
     # Now before we deal with any variables with lower bounds < 0,
     # deal with finite bounds which can be simply added as new constraints.
     # Also validate bounds inputs here.
-    for i in range(n):
-        if(L[i] > U[i]):
-            status = -1
+    lb_inf_positive = np.isinf(L) & (L > 0)
+    ub_inf_negative = np.isinf(U) & (U < 0)
+    invalid = np.flatnonzero((L > U) | lb_inf_positive | ub_inf_negative)
+    if invalid.size > 0:
+        status = -1
+        i = invalid[-1]
+        if ub_inf_negative[i]:
             message = ("Invalid input for linprog with method = 'simplex'.  "
-                       "Lower bound %d is greater than upper bound%d" % (i, i))
-
-        if np.isinf(L[i]) and L[i] > 0:
-            status = -1
+                       "Upper bound may not be -infinity")
+        elif lb_inf_positive[i]:
             message = ("Invalid input for linprog with method = 'simplex'.  "
                        "Lower bound may not be +infinity")
-
-        if np.isinf(U[i]) and U[i] < 0:
-            status = -1
+        else:
             message = ("Invalid input for linprog with method = 'simplex'.  "
-                       "Upper bound may not be -infinity")
-
-        if np.isfinite(L[i]) and L[i] > 0:
-            # Add a new lower-bound (negative upper-bound) constraint
-            Aub = np.vstack([Aub, np.zeros(n)])
-            Aub[-1, i] = -1
-            bub = np.concatenate([bub, np.array([-L[i]])])
-            L[i] = 0
-
-        if np.isfinite(U[i]):
-            # Add a new upper-bound constraint
-            Aub = np.vstack([Aub, np.zeros(n)])
-            Aub[-1, i] = 1
-            bub = np.concatenate([bub, np.array([U[i]])])
-            U[i] = np.inf
-
-    # Now find negative lower bounds (finite or infinite) which require a
-    # change of variables or free variables and handle them appropriately
-    for i in range(0, n):
-        if L[i] < 0:
-            if np.isfinite(L[i]) and L[i] < 0:
-                # Add a change of variables for x[i]
-                # For each row in the constraint matrices, we take the
-                # coefficient from column i in A,
-                # and subtract the product of that and L[i] to the RHS b
-                beq = beq - Aeq[:, i] * L[i]
-                bub = bub - Aub[:, i] * L[i]
-                # We now have a nonzero initial value for the objective
-                # function as well.
-                f0 = f0 - cc[i] * L[i]
-            else:
-                # This is an unrestricted variable, let x[i] = u[i] - v[0]
-                # where v is the first column in all matrices.
-                Aeq[:, 0] = Aeq[:, 0] - Aeq[:, i]
-                Aub[:, 0] = Aub[:, 0] - Aub[:, i]
-                cc[0] = cc[0] - cc[i]
-
-        if np.isinf(U[i]):
-            if U[i] < 0:
-                status = -1
-                message = ("Invalid input for linprog with "
-                           "method = 'simplex'.  Upper bound may not be -inf.")
-
-    # The number of upper bound constraints (rows in A_ub and elements in b_ub)
-    mub = len(bub)
-
-    # The number of equality constraints (rows in A_eq and elements in b_eq)
-    meq = len(beq)
-
-    # The total number of constraints
-    m = mub+meq
-
-    # The number of slack variables (one for each upper-bound constraints)
-    n_slack = mub
+                       "Lower bound %d is greater than upper bound%d" % (i, i))
 
-    # The number of artificial variables (one for each lower-bound and equality
-    # constraint)
-    n_artificial = meq + np.count_nonzero(bub < 0)
+    # Each finite positive lower bound becomes a new (negative) upper-bound
+    # constraint and each finite upper bound a new upper-bound constraint.
+    # The rows are ordered by variable, a lower bound preceding the upper
+    # bound of the same variable, and follow the rows of A_ub.
+    i_lb = np.flatnonzero(np.isfinite(L) & (L > 0))
+    i_ub = np.flatnonzero(np.isfinite(U))
+    n_bounds = len(i_lb) + len(i_ub)
+    order = np.argsort(np.concatenate([i_lb, i_ub]), kind='mergesort')
+    bounds_cols = np.concatenate([i_lb, i_ub])[order]
+    bounds_coefs = np.concatenate([-np.ones(len(i_lb)),
+                                   np.ones(len(i_ub))])[order]
+    b_bounds = np.concatenate([-L[i_lb], U[i_ub]])[order]
+    L[i_lb] = 0
+    U[i_ub] = np.inf
+
+    if np.any(np.isinf(U) & (U < 0)):
+        status = -1
+        message = ("Invalid input for linprog with "
+                   "method = 'simplex'.  Upper bound may not be -inf.")
 
     try:
         Aub_rows, Aub_cols = Aub.shape
@@ -690,97 +723,173 @@ def _linprog_simplex(c, A_ub=None, b_ub=None, A_eq=None, b_eq=None,
     except ValueError:
         raise ValueError("Invalid input.  A_eq must be two-dimensional")
 
-    if Aeq_rows != meq:
+    if Aeq_rows != len(beq):
         status = -1
         message = ("Invalid input for linprog with method = 'simplex'.  "
                    "The number of rows in A_eq must be equal "
                    "to the number of values in b_eq")
 
-    if Aub_rows != mub:
+    if Aub_rows != len(bub):
         status = -1
         message = ("Invalid input for linprog with method = 'simplex'.  "
                    "The number of rows in A_ub must be equal "
                    "to the number of values in b_ub")
 
-    if Aeq_cols > 0 and Aeq_cols != n:
+    if (Aeq_rows > 0 or Aeq_cols > 0) and Aeq_cols != n_A:
         status = -1
         message = ("Invalid input for linprog with method = 'simplex'.  "
                    "Number of columns in A_eq must be equal "
                    "to the size of c")
 
-    if Aub_cols > 0 and Aub_cols != n:
+    if (Aub_rows > 0 or Aub_cols > 0) and Aub_cols != n_A:
         status = -1
         message = ("Invalid input for linprog with method = 'simplex'.  "
                    "Number of columns in A_ub must be equal to the size of c")
 
+    dtype = np.dtype(dtype)
+    if dtype not in (np.dtype(np.float32), np.dtype(np.float64)):
+        status = -1
+        message = ("Invalid input for linprog with method = 'simplex'.  "
+                   "dtype must be float32 or float64")
+
     if status != 0:
         # Invalid inputs provided
         raise ValueError(message)
 
-    # Create the tableau
-    T = np.zeros([m+2, n+n_slack+n_artificial+1])
+    if dtype == np.float32:
+        # Smaller values are indistinguishable from single precision round off
+        tol = max(tol, 100 * np.finfo(dtype).eps)
+
+    # Now find negative lower bounds (finite or infinite) which require a
+    # change of variables or free variables and handle them appropriately
+    L_shift = np.where(np.isfinite(L) & (L < 0), L, 0)
+    if np.any(L_shift):
+        # Add a change of variables for each such x[i]
+        # For each row in the constraint matrices, we take the
+        # coefficients from these columns of A,
+        # and subtract their product with L to the RHS b
+        if Aeq_cols > 0:
+            beq = beq - Aeq.dot(L_shift[n - n_A:])
+        if Aub_cols > 0:
+            bub = bub - Aub.dot(L_shift[n - n_A:])
+        b_bounds = b_bounds - bounds_coefs * L_shift[bounds_cols]
+        # We now have a nonzero initial value for the objective
+        # function as well.
+        f0 = f0 - cc.dot(L_shift)
+    bub = np.concatenate([bub, b_bounds])
+
+    # Round the right hand sides to the tableau dtype now, so that the
+    # artificial variables are counted from the values the tableau holds
+    beq = beq.astype(dtype, copy=False)
+    bub = bub.astype(dtype, copy=False)
+
+    # The number of upper bound constraints (rows in A_ub and elements in b_ub)
+    mub = len(bub)
+
+    # The number of equality constraints (rows in A_eq and elements in b_eq)
+    meq = len(beq)
+
+    # The total number of constraints
+    m = mub+meq
+
+    # The number of slack variables (one for each upper-bound constraints)
+    n_slack = mub
+
+    # The number of artificial variables (one for each lower-bound and equality
+    # constraint)
+    n_artificial = meq + np.count_nonzero(bub < 0)
+
+    # Create the tableau.  It is stored in Fortran order so that the column
+    # accesses made when choosing pivots are contiguous in memory.
+    # The Phase 1 pseudo-objective row is only needed if there are
+    # artificial variables.
+    # Only dense Aeq and Aub blocks are written in full, so the rest of the
+    # tableau is zeroed region by region rather than all at once.
+    n_rows = m + 2 if n_artificial else m + 1
+    T = np.empty([n_rows, n+n_slack+n_artificial+1], dtype=dtype, order='F')
+    T[:, n:] = 0
+    T[meq+Aub_rows:m, :n] = 0
+    T[m+1:, :n] = 0
 
     # Insert objective into tableau
-    T[-2, :n] = cc
-    T[-2, -1] = f0
-
-    b = T[:-2, -1]
-
-    if meq > 0:
-        # Add Aeq to the tableau
-        T[:meq, :n] = Aeq
-        # Add beq to the tableau
-        b[:meq] = beq
-    if mub > 0:
-        # Add Aub to the tableau
-        T[meq:meq+mub, :n] = Aub
-        # At bub to the tableau
-        b[meq:meq+mub] = bub
-        # Add the slack variables to the tableau
-        np.fill_diagonal(T[meq:m, n:n+n_slack], 1)
+    T[m, :n] = cc
+    T[m, -1] = f0
+
+    b = T[:m, -1]
+
+    # Add Aeq, Aub and the bound constraints to the tableau, with the columns
+    # of Aeq and Aub following the floor variable if there is one
+    for A, row0 in ((Aeq, 0), (Aub, meq)):
+        if A.shape[0] == 0:
+            continue
+        rows = slice(row0, row0 + A.shape[0])
+        if sps.issparse(A):
+            T[rows, :n] = 0
+            np.add.at(T, (row0 + A.row, n - n_A + A.col), A.data)
+        else:
+            T[rows, :n-n_A] = 0
+            T[rows, n-n_A:n] = A
+    T[meq+Aub_rows+np.arange(n_bounds), bounds_cols] = bounds_coefs
+    b[:meq] = beq
+    b[meq:m] = bub
+    # Add the slack variables to the tableau
+    i_slack = np.arange(n_slack)
+    T[meq+i_slack, n+i_slack] = 1
+
+    i_free = np.flatnonzero(np.isinf(L) & (L < 0))
+    if i_free.size > 0:
+        # These are unrestricted variables, let x[i] = u[i] - v[0]
+        # where v is the first column in all matrices.
+        T[:m+1, 0] -= T[:m+1, i_free].sum(axis=1)
 
     # Further set up the tableau.
     # If a row corresponds to an equality constraint or a negative b (a lower
     # bound constraint), then an artificial variable is added for that row.
     # Also, if b is negative, first flip the signs in that constraint.
-    slcount = 0
-    avcount = 0
-    basis = np.zeros(m, dtype=int)
-    r_artificial = np.zeros(n_artificial, dtype=int)
-    for i in range(m):
-        if i < meq or b[i] < 0:
-            # basic variable i is in column n+n_slack+avcount
-            basis[i] = n+n_slack+avcount
-            r_artificial[avcount] = i
-            avcount += 1
-            if b[i] < 0:
-                b[i] *= -1
-                T[i, :-1] *= -1
-            T[i, basis[i]] = 1
-            T[-1, basis[i]] = 1
+    is_negative = b < 0
+    is_artificial = is_negative.copy()
+    is_artificial[:meq] = True
+    r_artificial = np.flatnonzero(is_artificial)
+    r_slack = np.flatnonzero(~is_artificial)
+    r_negative = np.flatnonzero(is_negative)
+    T[r_negative, :-1] *= -1
+    b[r_negative] *= -1
+
+    basis = np.empty(m, dtype=int)
+    # basic variable of the k-th artificial row is in column n+n_slack+k
+    basis[r_artificial] = n + n_slack + np.arange(n_artificial)
+    T[r_artificial, basis[r_artificial]] = 1
+    # the remaining rows are inequality constraints whose basic variable is
+    # their own slack variable, in column n+i-meq
+    basis[r_slack] = n + r_slack - meq
+
+    ctx = _SimplexContext(n, callback, tol, bland)
+
+    if n_artificial:
+        # Make the artificial variables basic feasible variables by
+        # subtracting each row with an artificial variable from the Phase 1
+        # objective
+        T[-1, basis[r_artificial]] = 1
+        T[-1, :] -= T[r_artificial, :].sum(axis=0)
+
+        nit1, status = _solve_simplex(T, basis, ctx, 1, maxiter)
+
+        # if pseudo objective is zero, remove the last row from the tableau
+        # and proceed to phase 2
+        pseudo_obj = float(T[-1, -1])
+        if math.fabs(pseudo_obj) < tol:
+            # Move the right hand side into the first artificial column, so
+            # that removing the pseudo-objective row and the artificial
+            # variable columns from the tableau is a view rather than a copy
+            T[:, n+n_slack] = T[:, -1]
+            T = T[:-1, :n+n_slack+1]
         else:
-            # basic variable i is in column n+slcount
-            basis[i] = n+slcount
-            slcount += 1
-
-    # Make the artificial variables basic feasible variables by subtracting
-    # each row with an artificial variable from the Phase 1 objective
-    for r in r_artificial:
-        T[-1, :] = T[-1, :] - T[r, :]
-
-    nit1, status = _solve_simplex(T, n, basis, phase=1, callback=callback,
-                                  maxiter=maxiter, tol=tol, bland=bland)
-
-    # if pseudo objective is zero, remove the last row from the tableau and
-    # proceed to phase 2
-    if abs(T[-1, -1]) < tol:
-        # Remove the pseudo-objective row from the tableau
-        T = T[:-1, :]
-        # Remove the artificial variable columns from the tableau
-        T = np.delete(T, np.s_[n+n_slack:n+n_slack+n_artificial], 1)
+            # Failure to find a feasible starting point
+            status = 2
     else:
-        # Failure to find a feasible starting point
-        status = 2
+        # The slack variables already form a basic feasible solution, so
+        # there is no Phase 1 problem to solve
+        nit1, status = 0, 0
 
     if status != 0:
         message = messages[status]
@@ -790,26 +899,22 @@ def _linprog_simplex(c, A_ub=None, b_ub=None, A_eq=None, b_eq=None,
                               status=status, message=message, success=False)
 
     # Phase 2
-    nit2, status = _solve_simplex(T, n, basis, maxiter=maxiter-nit1, phase=2,
-                                  callback=callback, tol=tol, nit0=nit1,
-                                  bland=bland)
+    nit2, status = _solve_simplex(T, basis, ctx, 2, maxiter-nit1, nit1)
 
-    solution = np.zeros(n+n_slack+n_artificial)
+    solution = np.zeros(n+n_slack+n_artificial, dtype=T.dtype)
     solution[basis[:m]] = T[:m, -1]
     x = solution[:n]
     slack = solution[n:n+n_slack]
 
     # For those variables with finite negative lower bounds,
     # reverse the change of variables
-    masked_L = np.ma.array(L, mask=np.isinf(L), fill_value=0.0).filled()
+    masked_L = np.where(np.isinf(L), 0.0, L).astype(T.dtype, copy=False)
     x = x + masked_L
 
     # For those variables with infinite negative lower bounds,
     # take x[i] as the difference between x[i] and the floor variable.
     if have_floor_variable:
-        for i in range(1, n):
-            if np.isinf(L[i]):
-                x[i] -= x[0]
+        x[1:][np.isinf(L[1:])] -= x[0]
         x = x[1:]
 
     # Optimization complete at this point
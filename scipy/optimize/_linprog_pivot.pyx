@@ -0,0 +1,58 @@
+"""
+Cython implementation of the simplex tableau pivot. Used by
+._linprog._apply_pivot.
+"""
+
+from __future__ import absolute_import
+
+cimport cython
+
+import numpy as np
+
+
+ctypedef fused floating:
+    float
+    double
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def pivot(floating [:, :] T, Py_ssize_t pivrow, Py_ssize_t pivcol):
+    """
+    Pivot the tableau `T` in place on the element ``T[pivrow, pivcol]``.
+
+    The pivot row is divided by the pivot element, then the pivot column is
+    eliminated from every other row.  Rows with a zero in the pivot column
+    and columns with a zero in the pivot row are left untouched.  The loops
+    follow the memory layout of `T`, so C ordered, Fortran ordered and
+    strided tableaux are all updated without a copy.
+    """
+    cdef Py_ssize_t m = T.shape[0]
+    cdef Py_ssize_t n = T.shape[1]
+    cdef bint rows_contiguous = T.strides[1] <= T.strides[0]
+    cdef Py_ssize_t i, j
+    cdef floating pivval, f
+
+    # The multipliers must be saved before the pivot column is overwritten.
+    cdef floating [::1] multipliers = np.array(T[:, pivcol])
+
+    with nogil:
+        pivval = T[pivrow, pivcol]
+        for j in range(n):
+            T[pivrow, j] /= pivval
+        multipliers[pivrow] = 0
+
+        if rows_contiguous:
+            for i in range(m):
+                f = multipliers[i]
+                if f == 0:
+                    continue
+                for j in range(n):
+                    T[i, j] -= T[pivrow, j] * f
+        else:
+            for j in range(n):
+                f = T[pivrow, j]
+                if f == 0:
+                    continue
+                for i in range(m):
+                    T[i, j] -= f * multipliers[i]
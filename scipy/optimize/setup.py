@@ -70,6 +70,8 @@ def configuration(parent_package='',top_path=None):
 
     config.add_extension('_group_columns', sources=['_group_columns.c'],)
 
+    config.add_extension('_linprog_pivot', sources=['_linprog_pivot.c'],)
+
     config.add_subpackage('_lsq')
     
     config.add_subpackage('_trlib')
@@ -7,7 +7,10 @@ import numpy as np
 from numpy.testing import assert_, assert_allclose, assert_equal
 from pytest import raises as assert_raises
 from scipy.optimize import linprog, OptimizeWarning
+from scipy.optimize._linprog import _pivot_row
+from scipy.optimize._linprog_pivot import pivot
 from scipy._lib._numpy_compat import _assert_warns, suppress_warnings
+from scipy.sparse import coo_matrix, csr_matrix
 from scipy.sparse.linalg import MatrixRankWarning
 
 import pytest
@@ -657,6 +660,122 @@ class TestLinprogSimplex(LinprogCommonTests):
         assert_(callback_complete[0])
         assert_allclose(last_xk[0], res.x)
 
+    def test_float32_tableau(self):
+        c = [-1, 4]
+        A_ub = [[-3, 1], [1, 2]]
+        b_ub = [6, 4]
+        bounds = [(None, None), (-3, None)]
+        res = linprog(c, A_ub=A_ub, b_ub=b_ub, bounds=bounds,
+                      method=self.method, options=dict(dtype=np.float32))
+        _assert_success(res, desired_fun=-22, desired_x=[10, -3],
+                        rtol=1e-6, atol=1e-6)
+        # the result is reported in the precision of the tableau
+        assert_equal(res.x.dtype, np.float32)
+        assert_equal(res.slack.dtype, np.float32)
+        assert_equal(np.asarray(res.fun).dtype, np.float32)
+
+        # with the default tol, single precision matches double precision
+        A, b, c_2d = lpgen_2d(6, 6)
+        res64 = linprog(c_2d, A_ub=A, b_ub=b, method=self.method)
+        res = linprog(c_2d, A_ub=A, b_ub=b, method=self.method,
+                      options=dict(dtype=np.float32))
+        _assert_success(res, desired_fun=res64.fun, desired_x=res64.x,
+                        rtol=1e-5, atol=1e-5)
+
+        assert_raises(ValueError, linprog, c, A_ub=A_ub, b_ub=b_ub,
+                      method=self.method, options=dict(dtype=np.int_))
+
+    def test_sparse_constraints(self):
+        A, b, c = lpgen_2d(4, 5)
+        res_dense = linprog(c, A_ub=A, b_ub=b, method=self.method)
+        res_sparse = linprog(c, A_ub=csr_matrix(A), b_ub=b,
+                             method=self.method)
+        _assert_success(res_sparse, desired_fun=res_dense.fun,
+                        desired_x=res_dense.x)
+
+        A_eq, b_eq, c, N = magic_square(3)
+        res_dense = linprog(c, A_eq=A_eq, b_eq=b_eq, bounds=(0, 1),
+                            method=self.method)
+        res_sparse = linprog(c, A_eq=csr_matrix(A_eq), b_eq=b_eq,
+                             bounds=(0, 1), method=self.method)
+        _assert_success(res_sparse, desired_fun=res_dense.fun,
+                        desired_x=res_dense.x)
+
+        # duplicate entries of a COO matrix are summed, and the columns of
+        # A_ub follow the floor variable of the unbounded x[0]
+        A_ub = coo_matrix(([-1, -2, 1, 1, 2], ([0, 0, 0, 1, 1],
+                                               [0, 0, 1, 0, 1])))
+        res = linprog([-1, 4], A_ub=A_ub, b_ub=[6, 4],
+                      bounds=[(None, None), (-3, None)], method=self.method)
+        _assert_success(res, desired_fun=-22, desired_x=[10, -3])
+
+    def test_slack_negative_b_ub(self):
+        # The slack of the second constraint must not be reported for the
+        # first one, whose right hand side is negative.
+        c = [1, 1]
+        A_ub = [[-1, 0], [1, 1]]
+        b_ub = [-1, 4]
+        res = linprog(c, A_ub=A_ub, b_ub=b_ub, method=self.method)
+        _assert_success(res, desired_fun=1, desired_x=[1, 0])
+        assert_allclose(res.slack, [0, 3], atol=1e-12)
+
+        # Right hand sides which round to -0.0 in the tableau dtype do not
+        # need an artificial variable
+        res = linprog(c, A_ub=[[-1, 0], [0, -1], [1, 1]],
+                      b_ub=[-1e-50, -1e-50, 4], method=self.method,
+                      options=dict(dtype=np.float32))
+        _assert_success(res, desired_fun=0, desired_x=[0, 0], atol=1e-6)
+
+    def test_no_variables(self):
+        res = linprog([], method=self.method)
+        assert_equal(res.status, 0)
+        assert_equal(res.x.size, 0)
+        res = linprog([], A_eq=[[]], b_eq=[0], method=self.method)
+        assert_equal(res.status, 0)
+
+    def test_constraints_without_columns(self):
+        # Constraint rows with no coefficients are not a valid A_ub or A_eq
+        assert_raises(ValueError, linprog, [1, 2], A_ub=[[]], b_ub=[1],
+                      method=self.method)
+        assert_raises(ValueError, linprog, [1, 2], A_eq=[[]], b_eq=[1],
+                      method=self.method)
+
+    def test_pivot_layouts(self):
+        # The pivot kernel must give the same result for every memory layout
+        def pivot_ref(T, pivrow, pivcol):
+            T = T.copy()
+            T[pivrow] /= T[pivrow, pivcol]
+            for i in range(T.shape[0]):
+                if i != pivrow:
+                    T[i] -= T[i, pivcol] * T[pivrow]
+            return T
+
+        np.random.seed(1234)
+        A = np.random.rand(12, 15)
+        A[A < 0.3] = 0
+        for dtype, rtol in ((np.float32, 1e-5), (np.float64, 1e-12)):
+            for order in ('C', 'F'):
+                big = np.array(A, dtype=dtype, order=order)
+                for T in (big, big[::2, 1::2], big[1::3, ::3]):
+                    T[1, 2] = 2
+                    expected = pivot_ref(T, 1, 2)
+                    pivot(T, 1, 2)
+                    assert_allclose(T, expected, rtol=rtol, atol=rtol)
+
+    def test_pivot_row_bland(self):
+        # Rows 0 and 1 tie in the ratio test.  Bland's rule picks the row
+        # whose basic variable has the lowest index, not the first row.
+        T = np.array([[1., 0., 0., 1., 2.],
+                      [1., 0., 1., 0., 2.],
+                      [-1., 0., 0., 0., 0.]])
+        basis = np.array([3, 2])
+        found, row = _pivot_row(T, basis, 0, phase=2)
+        assert_(found)
+        assert_equal(row, 0)
+        found, row = _pivot_row(T, basis, 0, phase=2, bland=True)
+        assert_(found)
+        assert_equal(row, 1)
+
 
 class BaseTestLinprogIP(LinprogCommonTests):
     method = "interior-point"